@@ -1,12 +1,19 @@
 import pygame
-import random
+import argparse
+import bisect
+import functools
+import statistics
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from enum import Enum, auto
-from pygame import mixer, freetype
+from pygame import mixer
 import os
 from pathlib import Path
+from game_state import GameState
+from run_history import RUN_HISTORY_DB
+from telemetry import TELEMETRY_LOG
+from text_pacing import CHAR_DELAY, reveal_schedule, next_text_speed, text_speed
 
 # File paths - Update these to match your actual file locations
 if os.path.exists("background.png"):
@@ -28,7 +35,8 @@ DARK_PARCHMENT = (168, 159, 129)    # #A89F81
 DARKER_BG = (42, 38, 34)            # #2A2622
 TRANSPARENT_BLACK = (0, 0, 0, 128)   # For overlay effects
 
-# UI Constants
+# UI Constants - all sizes are for the 1024x768 design resolution and
+# are scaled by Layout to the actual window size
 WINDOW_WIDTH = 1024
 WINDOW_HEIGHT = 768
 STATS_BOX_WIDTH = 250
@@ -37,251 +45,303 @@ BUTTON_WIDTH = 300
 BUTTON_HEIGHT = 60
 TEXT_AREA_WIDTH = 700
 
-class Skill(Enum):
-    OCCULTISM = ("Occultism", "Knowledge of forbidden arts")
-    COMBAT = ("Combat", "Martial prowess")
-    PERSUASION = ("Persuasion", "Social influence")
-    SURVIVAL = ("Survival", "Adaptability in harsh conditions")
-    LORE = ("Lore", "Ancient knowledge")
-    WILLPOWER = ("Willpower", "Mental fortitude")
+# Input - only these events are queued; everything else is dropped by SDL
+INPUT_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.WINDOWSIZECHANGED]
+RESPONSE_EVENTS = {pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN}  # Draw a frame at once
+CHOICE_KEYS = {
+    pygame.K_1: '1', pygame.K_2: '2', pygame.K_3: '3',
+    pygame.K_KP1: '1', pygame.K_KP2: '2', pygame.K_KP3: '3'
+}
+FRAME_TIME = 1000 // 60  # Milliseconds between frames when nothing happens
+LATENCY_SAMPLES = 200  # Recent input-to-frame times kept for the report
+
+class Layout:
+    """Window positions and sizes for one window size."""
+    def __init__(self, size: Tuple[int, int]):
+        self.width, self.height = size
+        self.scale = min(self.width / WINDOW_WIDTH, self.height / WINDOW_HEIGHT)
+        # Story text and buttons keep the design aspect ratio, centered
+        self.offset_x = (self.width - WINDOW_WIDTH * self.scale) / 2
+        self.offset_y = (self.height - WINDOW_HEIGHT * self.scale) / 2
+        
+        # Stats panels hug the top corners of the window
+        self.core_stats_rect = pygame.Rect(
+            self.width - self.px(STATS_BOX_WIDTH + 10),
+            self.px(10),
+            self.px(STATS_BOX_WIDTH),
+            self.px(100)
+        )
+        self.skills_rect = pygame.Rect(
+            self.px(10),
+            self.px(10),
+            self.px(STATS_BOX_WIDTH),
+            self.px(STATS_BOX_HEIGHT)
+        )
+        
+        # Story text area, right of the skills box and clear of the core stats
+        self.text_pos = self.point(300, 200)
+        self.text_width = self.px(650)
+        self.line_spacing = self.px(30)
+        
+    def px(self, length: float) -> int:
+        """Scale a design length to window pixels."""
+        return max(1, round(length * self.scale))
+        
+    def point(self, x: float, y: float) -> Tuple[int, int]:
+        """Map a design position into the centered content area."""
+        return (round(self.offset_x + x * self.scale), round(self.offset_y + y * self.scale))
+        
+    def rect(self, x: float, y: float, width: float, height: float) -> pygame.Rect:
+        """Map a design rect into the centered content area."""
+        return pygame.Rect(self.point(x, y), (self.px(width), self.px(height)))
+
+# Resolution-dependent assets. Each is built once per window size and kept
+# in a small LRU cache, so resizing back and forth between kiosk
+# resolutions doesn't rerun the blur and scale pipeline.
+
+@functools.lru_cache(maxsize=16)
+def load_font(path, size: int) -> pygame.font.Font:
+    """Load a font at one pixel size, falling back to the default font."""
+    if path is not None:
+        try:
+            return pygame.font.Font(str(path), size)
+        except (OSError, pygame.error):
+            print("Warning: Custom font not found, using default font")
+    return pygame.font.Font(None, size)
+
+@functools.lru_cache(maxsize=1)
+def load_background_image() -> pygame.Surface:
+    """Load the full resolution background image."""
+    return pygame.image.load(str(BACKGROUND_IMG))
+
+@functools.lru_cache(maxsize=3)
+def build_background(size: Tuple[int, int]) -> pygame.Surface:
+    """Blurred, darkened background with the stats panels, for one window size."""
+    width, height = size
+    
+    # Apply strong blur effect by scaling down to 1/8 size and back up
+    small = pygame.transform.smoothscale(load_background_image(), (max(1, width // 4), max(1, height // 4)))
+    smaller = pygame.transform.smoothscale(small, (max(1, width // 8), max(1, height // 8)))
+    background = pygame.transform.smoothscale(smaller, size)
+    
+    # Add dark overlay
+    overlay = pygame.Surface(size)
+    overlay.fill((0, 0, 0))
+    overlay.set_alpha(120)
+    background.blit(overlay, (0, 0))
+    
+    # Stats panel backgrounds
+    layout = Layout(size)
+    pygame.draw.rect(background, TRANSPARENT_BLACK, layout.core_stats_rect)
+    pygame.draw.rect(background, TRANSPARENT_BLACK, layout.skills_rect)
+    
+    if pygame.display.get_surface():
+        background = background.convert()
+    return background
+
+def wrap_lines(text: str, font, max_width: int) -> List[Tuple[int, int]]:
+    """Word wrap text to a pixel width, as the start and end of each line.
     
-    def __init__(self, display_name: str, description: str):
-        self.display_name = display_name
-        self.description = description
-
-@dataclass
-class Location:
-    name: str
-    description: str
-    is_discovered: bool = False
-    is_cleared: bool = False
-    required_trials: int = 0
-    trials_completed: int = 0
+    Explicit line breaks start a new line; blank lines are dropped.
+    """
+    lines = []
+    paragraph_start = 0
+    for paragraph in text.split('\n'):
+        line_start = line_end = None
+        word_start = paragraph_start
+        for word in paragraph.split(' '):
+            word_end = word_start + len(word)
+            if word:
+                if line_start is None:
+                    line_start = word_start
+                elif font.size(text[line_start:word_end])[0] > max_width:
+                    lines.append((line_start, line_end))
+                    line_start = word_start
+                line_end = word_end
+            word_start = word_end + 1
+        if line_start is not None:
+            lines.append((line_start, line_end))
+        paragraph_start += len(paragraph) + 1
+    return lines
+
+class WrappedText:
+    """Story text wrapped to the text area, with every line rendered once."""
+    def __init__(self, text: str, font, max_width: int, color=PARCHMENT_YELLOW):
+        self.text = text.replace('\\n', '\n')  # Handle explicit line breaks
+        self.max_width = max_width
+        self.lines = [
+            (start, end, font.render(self.text[start:end], True, color))
+            for start, end in wrap_lines(self.text, font, max_width)
+        ]
 
 class TextRenderer:
     def __init__(self, screen, font, sound):
         self.screen = screen
         self.font = font
         self.sound = sound
-        self.current_text = ""
         self.target_text = ""
+        self.wrapped = None  # Layout of target_text
         self.text_pos = (300, 200)  # Moved right to avoid skills box
-        self.char_delay = 50
-        self.last_char_time = 0
+        self.char_delay = CHAR_DELAY
+        self.speed = 1.0  # Reading speed multiplier, None for instant text
+        self.schedule = []  # Reveal time of each character, relative to reveal_start
+        self.reveal_start = None
         self.text_color = PARCHMENT_YELLOW
         self.line_spacing = 30
         self.max_line_width = 650  # Reduced to avoid right side stats
         self.next_char_index = 0
         
-    def set_text(self, text: str):
-        """Set new text to be rendered."""
-        self.target_text = text.replace('\\n', '\n')  # Handle explicit line breaks
-        self.current_text = ""
+    def resize(self, screen, layout: Layout, font):
+        """Move and rewrap the text for a new window size."""
+        self.screen = screen
+        self.font = font
+        self.text_pos = layout.text_pos
+        self.line_spacing = layout.line_spacing
+        self.max_line_width = layout.text_width
+        self.wrapped = WrappedText(self.target_text, self.font, self.max_line_width, self.text_color)
+        
+    def set_text(self, text: str, wrapped: Optional[WrappedText] = None):
+        """Set new text to be rendered, using its prepared layout if given."""
+        if wrapped is None or wrapped.max_width != self.max_line_width:
+            wrapped = WrappedText(text, self.font, self.max_line_width, self.text_color)
+        self.wrapped = wrapped
+        self.target_text = wrapped.text
         self.next_char_index = 0
+        self.schedule = reveal_schedule(self.target_text, self.char_delay, self.speed)
+        self.reveal_start = None  # Starts on the next update
+        
+    def set_speed(self, speed, current_time):
+        """Change the reading speed without jumping the current reveal."""
+        self.speed = speed
+        self.schedule = reveal_schedule(self.target_text, self.char_delay, speed)
+        if self.reveal_start is not None:
+            shown = self.schedule[self.next_char_index - 1] if self.next_char_index else 0
+            self.reveal_start = current_time - shown
+        
+    def is_revealed(self) -> bool:
+        """Whether the whole target text is showing."""
+        return self.next_char_index >= len(self.target_text)
+        
+    def reveal_all(self):
+        """Show the whole target text immediately."""
+        self.next_char_index = len(self.target_text)
         
     def update(self, current_time):
-        """Update the current text being displayed."""
-        if self.next_char_index < len(self.target_text):
-            if current_time - self.last_char_time > self.char_delay:
-                # Add next character
-                self.current_text += self.target_text[self.next_char_index]
-                self.next_char_index += 1
-                
-                # Play sound with random pitch for non-space characters
-                if self.target_text[self.next_char_index - 1] not in [' ', '\n']:
-                    pitch = random.uniform(0.8, 1.2)
-                    self.sound.set_volume(0.3)
-                    self.sound.play()
-                    # Note: In newer Pygame versions, you might be able to use:
-                    # pygame.mixer.Sound.play(self.sound, pitch=pitch)
-                
-                self.last_char_time = current_time
+        """Reveal every character whose scheduled time has passed."""
+        if self.is_revealed():
+            return
+        if self.reveal_start is None:
+            self.reveal_start = current_time
+        
+        # Catch up on everything due since the last frame in one batch
+        due = bisect.bisect_right(self.schedule, current_time - self.reveal_start)
+        if due <= self.next_char_index:
+            return
+        batch = self.target_text[self.next_char_index:due]
+        self.next_char_index = due
+        
+        # One click per batch, and none for batches of only whitespace
+        if self.sound and batch.strip():
+            self.sound.set_volume(0.3)
+            self.sound.play()
                 
     def render(self):
-        """Render the current text to the screen with proper word wrapping."""
-        words = self.current_text.split(' ')
-        lines = []
-        current_line = []
-        
-        for word in words:
-            # Handle explicit line breaks in words
-            if '\n' in word:
-                subwords = word.split('\n')
-                for i, subword in enumerate(subwords):
-                    if subword:  # If not empty
-                        current_line.append(subword)
-                    if i < len(subwords) - 1:  # Don't add after last subword
-                        if current_line:
-                            lines.append(' '.join(current_line))
-                        current_line = []
-                continue
-                
-            test_line = ' '.join(current_line + [word])
-            test_surface = self.font.render(test_line, True, self.text_color)
-            
-            if test_surface.get_width() > self.max_line_width:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    lines.append(word)
-            else:
-                current_line.append(word)
-                
-        if current_line:
-            lines.append(' '.join(current_line))
-            
-        # Render each line
-        y = self.text_pos[1]
-        for line in lines:
-            if line:  # Only render non-empty lines
-                text_surface = self.font.render(line, True, self.text_color)
-                self.screen.blit(text_surface, (self.text_pos[0], y))
+        """Render the revealed part of the text.
+        
+        Lines are wrapped for the whole text up front, so words don't jump
+        to the next line as they are typed. Returns the rect of each
+        rendered line for layout checks.
+        """
+        line_rects = []
+        if self.wrapped is None:
+            return line_rects
+        x, y = self.text_pos
+        for start, end, surface in self.wrapped.lines:
+            if self.next_char_index <= start:
+                break
+            if self.next_char_index < end:
+                # Only the line being typed is rendered each frame
+                surface = self.font.render(self.target_text[start:self.next_char_index], True, self.text_color)
+            line_rects.append(self.screen.blit(surface, (x, y)))
             y += self.line_spacing
+        return line_rects
 
 class StatsDisplay:
     def __init__(self, screen, font):
         self.screen = screen
-        self.font = pygame.font.Font(None, 20)  # Smaller font for stats
+        self.resize(screen, Layout(screen.get_size()))
+
+    def resize(self, screen, layout: Layout):
+        """Resize the panels and fonts for a new window size."""
+        self.screen = screen
+        self.layout = layout
+        self.font = load_font(None, layout.px(20))  # Smaller font for stats
         # Core stats display (top right)
-        self.core_stats_rect = pygame.Rect(
-            WINDOW_WIDTH - STATS_BOX_WIDTH - 10,
-            10,
-            STATS_BOX_WIDTH,
-            100
-        )
+        self.core_stats_rect = layout.core_stats_rect
         # Skills display (top left)
-        self.skills_rect = pygame.Rect(
-            10,
-            10,
-            STATS_BOX_WIDTH,
-            STATS_BOX_HEIGHT
-        )
-        self.bar_height = 12  # Reduced from 15
-        self.bar_padding = 4  # Reduced from 5
-        self.section_padding = 15  # Reduced from 20
+        self.skills_rect = layout.skills_rect
+        self.bar_height = layout.px(12)  # Reduced from 15
+        self.bar_padding = layout.px(4)  # Reduced from 5
+        self.section_padding = layout.px(15)  # Reduced from 20
 
     def draw_stat_bar(self, pos, value, max_value, name, color=PARCHMENT_YELLOW):
         """Draw a labeled stat bar."""
+        px = self.layout.px
         x, y = pos
-        width = self.core_stats_rect.width - 20  # Reduced padding
-        
-        # Draw label
-        label = self.font.render(name, True, PARCHMENT_YELLOW)
-        self.screen.blit(label, (x, y))
-        
-        # Draw bar background
-        bar_bg_rect = pygame.Rect(x, y + 15, width, self.bar_height)  # Adjusted spacing
-        pygame.draw.rect(self.screen, DARKER_BG, bar_bg_rect)
-        
-        # Draw bar fill
-        fill_width = int((value / max_value) * width)
-        bar_fill_rect = pygame.Rect(x, y + 15, fill_width, self.bar_height)
-        pygame.draw.rect(self.screen, color, bar_fill_rect)
-        
-        # Draw value text in smaller font
-        value_text = self.font.render(f"{value}%", True, PARCHMENT_YELLOW)
-        text_pos = (x + width + 5, y + 8)
-        self.screen.blit(value_text, text_pos)
-
-    def render(self, core_stats: Dict, skills: Dict):
-        """Render both core stats and skills."""
-        # Draw backgrounds with reduced alpha
-        s = pygame.Surface((self.core_stats_rect.width, self.core_stats_rect.height))
-        s.set_alpha(100)
-        s.fill((0, 0, 0))
-        self.screen.blit(s, self.core_stats_rect)
-        
-        s = pygame.Surface((self.skills_rect.width, self.skills_rect.height))
-        s.set_alpha(100)
-        s.fill((0, 0, 0))
-        self.screen.blit(s, self.skills_rect)
-        
-        # Draw core stats
-        y_offset = self.core_stats_rect.top + 8
-        for stat_name, value in core_stats.items():
-            self.draw_stat_bar(
-                (self.core_stats_rect.left + 10, y_offset),
-                value,
-                100,
-                stat_name
-            )
-            y_offset += 30  # Reduced spacing
-            
-        # Draw skills
-        y_offset = self.skills_rect.top + 8
-        title = self.font.render("SKILLS", True, PARCHMENT_YELLOW)
-        self.screen.blit(title, (self.skills_rect.left + 10, y_offset))
-        y_offset += 25  # Reduced spacing
-        
-        for skill, value in skills.items():
-            self.draw_stat_bar(
-                (self.skills_rect.left + 10, y_offset),
-                value,
-                20,  # Max skill value
-                skill.display_name,
-                DARK_PARCHMENT
-            )
-            y_offset += 30  # Reduced spacing
-        
-    def draw_stat_bar(self, pos, value, max_value, name, color=PARCHMENT_YELLOW):
-        """Draw a labeled stat bar."""
-        x, y = pos
-        width = self.core_stats_rect.width - 40
+        width = self.core_stats_rect.width - px(40)
         
         # Draw label
         label = self.font.render(name, True, PARCHMENT_YELLOW)
         self.screen.blit(label, (x, y))
         
         # Draw bar background
-        bar_bg_rect = pygame.Rect(x, y + 20, width, self.bar_height)
+        bar_bg_rect = pygame.Rect(x, y + px(20), width, self.bar_height)
         pygame.draw.rect(self.screen, DARKER_BG, bar_bg_rect)
         
         # Draw bar fill
         fill_width = int((value / max_value) * width)
-        bar_fill_rect = pygame.Rect(x, y + 20, fill_width, self.bar_height)
+        bar_fill_rect = pygame.Rect(x, y + px(20), fill_width, self.bar_height)
         pygame.draw.rect(self.screen, color, bar_fill_rect)
         
         # Draw value text
         value_text = self.font.render(f"{value}%", True, PARCHMENT_YELLOW)
-        text_pos = (x + width + 5, y + 10)
+        text_pos = (x + width + px(5), y + px(10))
         self.screen.blit(value_text, text_pos)
         
     def render(self, core_stats: Dict, skills: Dict):
         """Render both core stats and skills."""
-        # Draw backgrounds
-        pygame.draw.rect(self.screen, TRANSPARENT_BLACK, self.core_stats_rect)
-        pygame.draw.rect(self.screen, TRANSPARENT_BLACK, self.skills_rect)
+        # Panel backgrounds are part of the cached background layer
+        px = self.layout.px
         
         # Draw core stats
-        y_offset = self.core_stats_rect.top + 10
+        y_offset = self.core_stats_rect.top + px(10)
         for stat_name, value in core_stats.items():
             self.draw_stat_bar(
-                (self.core_stats_rect.left + 20, y_offset),
+                (self.core_stats_rect.left + px(20), y_offset),
                 value,
                 100,
                 stat_name
             )
-            y_offset += 35
+            y_offset += px(35)
             
         # Draw skills
-        y_offset = self.skills_rect.top + 10
+        y_offset = self.skills_rect.top + px(10)
         title = self.font.render("SKILLS", True, PARCHMENT_YELLOW)
-        self.screen.blit(title, (self.skills_rect.left + 20, y_offset))
-        y_offset += 30
+        self.screen.blit(title, (self.skills_rect.left + px(20), y_offset))
+        y_offset += px(30)
         
         for skill, value in skills.items():
             self.draw_stat_bar(
-                (self.skills_rect.left + 20, y_offset),
+                (self.skills_rect.left + px(20), y_offset),
                 value,
                 20,  # Max skill value
                 skill.display_name,
                 DARK_PARCHMENT
             )
-            y_offset += 40
+            y_offset += px(40)
 
 class Button:
-    def __init__(self, rect, text, action, font):
+    def __init__(self, rect, text, action, font, border_width=2):
         self.rect = rect
         self.text = text
         self.action = action
@@ -291,167 +351,323 @@ class Button:
         self.hover_color = (62, 58, 54)  # Slightly lighter than DARKER_BG
         self.text_color = PARCHMENT_YELLOW
         self.border_color = DARK_PARCHMENT
+        self.border_width = border_width
+        self.text_surface = font.render(text, True, self.text_color)
         
     def draw(self, screen):
         # Draw button background
         color = self.hover_color if self.is_hovered else self.normal_color
         pygame.draw.rect(screen, color, self.rect)
-        pygame.draw.rect(screen, self.border_color, self.rect, 2)  # Border
+        pygame.draw.rect(screen, self.border_color, self.rect, self.border_width)  # Border
         
         # Draw text centered on button
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
-        
-    def handle_event(self, event):
-        if event.type == pygame.MOUSEMOTION:
-            self.is_hovered = self.rect.collidepoint(event.pos)
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1 and self.is_hovered:
-                return self.action
-        return None
+        text_rect = self.text_surface.get_rect(center=self.rect.center)
+        screen.blit(self.text_surface, text_rect)
+
+def layout_choice_buttons(options: Dict, layout: Layout, font) -> List[Button]:
+    """Buttons for an encounter's choices, stacked above the bottom of the window."""
+    buttons = []
+    button_spacing = 20
+    total_height = (BUTTON_HEIGHT * len(options)) + (button_spacing * (len(options) - 1))
+    start_y = WINDOW_HEIGHT - total_height - 100
+    
+    for i, (key, (text, _, _, _)) in enumerate(options.items()):
+        button_rect = layout.rect(
+            (WINDOW_WIDTH - BUTTON_WIDTH) // 2,
+            start_y + (BUTTON_HEIGHT + button_spacing) * i,
+            BUTTON_WIDTH,
+            BUTTON_HEIGHT
+        )
+        buttons.append(Button(button_rect, text, key, font, layout.px(2)))
+    return buttons
 
-class DarkFantasyGame:
-    def __init__(self):
+class DarkFantasyGame(GameState):
+    def __init__(self, audio=True, telemetry_path=TELEMETRY_LOG, history_path=RUN_HISTORY_DB, display_mode='windowed'):
         pygame.init()
-        mixer.init()
+        if audio:
+            mixer.init()
         
         # Set up display
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.windowed_size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.set_display_mode(display_mode)
         pygame.display.set_caption("Dark Path")
+        
+        # Keep the event queue down to the input we act on
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(INPUT_EVENTS)
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
 
-        # Load font with smaller sizes
-        try:
-            self.font = pygame.font.Font("NIGHTMARE_PILLS.ttf", 24)  # Reduced from 32
-            self.button_font = pygame.font.Font("NIGHTMARE_PILLS.ttf", 20)  # Reduced from 28
-        except:
-            print("Warning: Custom font not found, using default font")
-            self.font = pygame.font.Font(None, 24)
-            self.button_font = pygame.font.Font(None, 20)
-        
-        # Load and scale background
-        self.background = pygame.image.load(str(BACKGROUND_IMG))
-        self.background = pygame.transform.scale(self.background, (WINDOW_WIDTH, WINDOW_HEIGHT))
-        
-        # Apply strong blur effect
-        small = pygame.transform.smoothscale(self.background, (256, 192))
-        smaller = pygame.transform.smoothscale(small, (128, 96))
-        self.background = pygame.transform.smoothscale(smaller, (WINDOW_WIDTH, WINDOW_HEIGHT))
-        
-        # Add dark overlay
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(120)
-        self.background.blit(overlay, (0, 0))
-        
-        # Set up audio
-        self.typewriter_sound = mixer.Sound(str(TYPEWRITER_SOUND))
-        mixer.music.load(str(BACKGROUND_AMBIANCE))
-        mixer.music.play(-1)
-        mixer.music.set_volume(0.3)
+        # Set up audio (silent when rendering headless)
+        self.typewriter_sound = None
+        if audio:
+            self.typewriter_sound = mixer.Sound(str(TYPEWRITER_SOUND))
+            mixer.music.load(str(BACKGROUND_AMBIANCE))
+            mixer.music.play(-1)
+            mixer.music.set_volume(0.3)
         
         # Set up UI elements
-        self.text_renderer = TextRenderer(self.screen, self.font, self.typewriter_sound)
-        self.stats_display = StatsDisplay(self.screen, self.font)
+        self.text_renderer = TextRenderer(self.screen, None, self.typewriter_sound)
+        self.stats_display = StatsDisplay(self.screen, None)
         self.buttons = []
+        self.button_rects = []
+        self.text_speed = 'normal'
+        self.current_encounter = None
         
-        # Initialize game state
-        self.initialize_game_state()
+        # Prepares the next encounter's screen while the current one is read
+        self.prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+        self.prefetched = None  # Future of the prepared screen
+        self.apply_layout()
         
-        # Game flow control
-        self.current_state = 'intro'
-        self.awaiting_choice = False
-        self.current_encounter = None
+        # Initialize game state
+        super().__init__(telemetry_path, history_path)
+
+    def set_display_mode(self, mode: str):
+        """Open the window as 'windowed', 'fullscreen' or 'scaled'."""
+        self.display_mode = mode
+        if mode == 'fullscreen':
+            # Render natively at the desktop resolution
+            pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        elif mode == 'scaled':
+            # Render at the design resolution and let SDL scale it with filtering
+            os.environ.setdefault('SDL_RENDER_SCALE_QUALITY', 'linear')
+            pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SCALED | pygame.RESIZABLE)
+        else:
+            pygame.display.set_mode(self.windowed_size, pygame.RESIZABLE)
+        self.screen = pygame.display.get_surface()
+
+    def toggle_fullscreen(self):
+        """Switch between fullscreen and the previous window mode."""
+        if self.display_mode == 'scaled':
+            pygame.display.toggle_fullscreen()  # Logical size is unchanged
+            return
+        if self.display_mode == 'fullscreen':
+            self.set_display_mode('windowed')
+        else:
+            self.windowed_size = self.screen.get_size()
+            self.set_display_mode('fullscreen')
+        self.apply_layout()
 
-    def initialize_game_state(self):
-        """Initialize all game variables."""
-        # Core stats
-        self.health = 100
-        self.sanity = 100
-        self.corruption = 0
-        self.encounters_completed = 0
-        
-        # Generate character skills
-        self.skills = {}
-        available_skills = list(Skill)
-        primary_skill, secondary_skill = random.sample(available_skills, 2)
-        
-        for skill in available_skills:
-            if skill == primary_skill:
-                self.skills[skill] = sum(random.randint(1, 6) for _ in range(4))
-            elif skill == secondary_skill:
-                self.skills[skill] = sum(random.randint(1, 6) for _ in range(3))
-            else:
-                self.skills[skill] = sum(random.randint(1, 6) for _ in range(2))
-        
-        # Game state flags
-        self.flags = {
-            'has_ritual_knowledge': False,
-            'encountered_witch': False,
-            'priest_alive': True,
-            'ancient_door_opened': False,
-            'made_deal_with_creature': False,
-            'found_ancient_tome': False,
-            'cursed_by_witch': False
-        }
+    def apply_layout(self):
+        """Lay out every UI element for the current window size."""
+        self.screen = pygame.display.get_surface()
+        self.layout = Layout(self.screen.get_size())
         
-        # Procedural elements
-        self.current_weather = random.choice(['stormy', 'misty', 'clear but dark'])
-        self.moon_phase = random.choice(['new', 'waxing', 'full', 'waning'])
-        self.village_state = random.choice(['fearful', 'hostile', 'desperate'])
-        
-        # Location tracking
-        self.locations = {
-            'ancient_ruins': Location(
-                'Ancient Ruins',
-                'A crumbling structure emanating dark energy',
-                required_trials=3
-            ),
-            'witch_hut': Location(
-                'Witch\'s Hut',
-                'A crooked cottage deep in the woods'
-            ),
-            'forbidden_grove': Location(
-                'Forbidden Grove',
-                'A twisted grove where the trees whisper'
+        # Load font with smaller sizes
+        self.font = load_font(FONT_PATH, self.layout.px(24))  # Reduced from 32
+        self.button_font = load_font(FONT_PATH, self.layout.px(20))  # Reduced from 28
+        
+        # Fonts of the same sizes for the prefetch thread, which must not
+        # share font objects with the frame loop; bypasses the font cache
+        self.prefetch_fonts = (
+            load_font.__wrapped__(FONT_PATH, self.layout.px(24)),
+            load_font.__wrapped__(FONT_PATH, self.layout.px(20))
+        )
+        
+        self.background = build_background(self.screen.get_size())
+        self.text_renderer.resize(self.screen, self.layout, self.font)
+        self.stats_display.resize(self.screen, self.layout)
+        if self.buttons:
+            self.create_choice_buttons(self.current_encounter['options'])
+        
+        # A screen prepared for the old size is no use; prepare it again
+        if self.prefetched is not None:
+            self.prefetch_scene()
+
+    def prefetch_scene(self):
+        """Start preparing the next encounter's screen on the prefetch thread.
+        
+        Any screen prepared earlier is dropped, so this also discards the
+        prefetch when a run ends instead of continuing.
+        """
+        self.prefetched = None
+        if self.next_encounter is not None:
+            self.prefetched = self.prefetcher.submit(
+                self.build_scene, self.next_encounter, self.layout, self.prefetch_fonts
             )
+
+    def build_scene(self, encounter: Dict, layout: Layout, fonts) -> Dict:
+        """Wrap and render an encounter's text and buttons for one window size."""
+        text_font, button_font = fonts
+        return {
+            'encounter': encounter,
+            'size': (layout.width, layout.height),
+            'text': WrappedText(encounter['description'], text_font, layout.text_width),
+            'buttons': layout_choice_buttons(encounter['options'], layout, button_font)
         }
 
+    def take_prefetched_scene(self) -> Optional[Dict]:
+        """The prepared screen for the current encounter, if it is still valid."""
+        future, self.prefetched = self.prefetched, None
+        if future is None:
+            return None
+        try:
+            scene = future.result()  # Normally finished while the result was read
+        except Exception as e:
+            # The frame loop builds the screen itself instead
+            print(f"Warning: Could not prepare the next screen: {e}")
+            return None
+        if scene['encounter'] is not self.current_encounter:
+            return None
+        if scene['size'] != (self.layout.width, self.layout.height):
+            return None
+        return scene
+
     def create_choice_buttons(self, options):
         """Create buttons for current choices."""
+        self.set_choice_buttons(layout_choice_buttons(options, self.layout, self.button_font))
+
+    def set_choice_buttons(self, buttons: List[Button]):
+        """Show a set of choice buttons."""
+        self.buttons = buttons
+        
+        # Hit-test clicks against the rects directly, without waiting for hover
+        self.button_rects = [button.rect for button in self.buttons]
+        self.update_hover(pygame.mouse.get_pos())
+
+    def clear_choice_buttons(self):
+        """Remove the choice buttons."""
         self.buttons.clear()
-        button_spacing = 20
-        total_height = (BUTTON_HEIGHT * len(options)) + (button_spacing * (len(options) - 1))
-        start_y = WINDOW_HEIGHT - total_height - 100
-        
-        for i, (key, (text, _, _, _)) in enumerate(options.items()):
-            button_rect = pygame.Rect(
-                (WINDOW_WIDTH - BUTTON_WIDTH) // 2,
-                start_y + (BUTTON_HEIGHT + button_spacing) * i,
-                BUTTON_WIDTH,
-                BUTTON_HEIGHT
-            )
-            self.buttons.append(Button(button_rect, text, key, self.button_font))
+        self.button_rects = []
 
-    def handle_input(self) -> Optional[str]:
-        """Handle mouse and keyboard input."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return 'quit'
-                
-            # Handle button events when awaiting choice
-            if self.awaiting_choice:
-                for button in self.buttons:
-                    result = button.handle_event(event)
-                    if result:
-                        return result
-                        
-            # Handle space to continue when not awaiting choice
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+    def button_at(self, pos) -> Optional[Button]:
+        """The button under a screen position, if any."""
+        index = pygame.Rect(pos, (1, 1)).collidelist(self.button_rects)
+        return self.buttons[index] if index != -1 else None
+
+    def update_hover(self, pos):
+        """Highlight the button under the mouse."""
+        hovered = self.button_at(pos)
+        for button in self.buttons:
+            button.is_hovered = button is hovered
+
+    def wait_for_input(self, until: int) -> List[Tuple[pygame.event.Event, float]]:
+        """Collect events until the next frame is due, returning early on a key or click.
+        
+        Each event comes with the earliest time it can have arrived. Events
+        that queued up while the last frame was drawn are charged from the
+        last time the queue was seen empty, so latency is never understated.
+        """
+        polled = time.perf_counter()
+        events = [(event, self.queue_empty_since) for event in pygame.event.get()]
+        self.queue_empty_since = polled
+        while not any(event.type in RESPONSE_EVENTS for event, _ in events):
+            timeout = until - pygame.time.get_ticks()
+            if timeout <= 0:
+                break
+            event = pygame.event.wait(timeout)
+            now = time.perf_counter()
+            if event.type == pygame.NOEVENT:
+                self.queue_empty_since = now
+                break
+            events.append((event, now))
+        return events
+
+    def handle_event(self, event) -> Optional[str]:
+        """Turn one input event into a game action."""
+        if event.type == pygame.QUIT:
+            return 'quit'
+        
+        # Re-layout for the new window size; assets come from the cache
+        if event.type == pygame.WINDOWSIZECHANGED:
+            self.apply_layout()
+            if self.display_mode == 'windowed':
+                self.windowed_size = self.screen.get_size()
+            return None
+        
+        if event.type == pygame.MOUSEMOTION:
+            self.update_hover(event.pos)
+            return None
+        
+        # Clicks and taps are hit-tested at their own position, so touch
+        # screens that never send motion work on the first tap
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button != 1:
+                return None
+            button = self.button_at(event.pos)
+            if button and self.awaiting_choice:
+                return button.action
+            if not self.text_renderer.is_revealed():
+                return 'reveal'
+            if not self.awaiting_choice:
                 return 'continue'
-                
+            return None
+        
+        if event.type != pygame.KEYDOWN:
+            return None
+        
+        # F11 toggles fullscreen
+        if event.key == pygame.K_F11:
+            return 'fullscreen'
+        
+        # T cycles the reading speed
+        if event.key == pygame.K_t:
+            return 'text_speed'
+        
+        # 1-3 pick a choice at once, like clicking its button mid-reveal
+        if self.awaiting_choice and self.buttons and event.key in CHOICE_KEYS:
+            return CHOICE_KEYS[event.key]
+        
+        # Any other key first finishes the typewriter reveal
+        if not self.text_renderer.is_revealed():
+            return 'reveal'
+        
+        # L opens the run history from any screen without choices
+        if event.key == pygame.K_l:
+            return 'leaderboard'
+        
+        # SPACE continues
+        if not self.awaiting_choice and event.key == pygame.K_SPACE:
+            return 'continue'
         return None
 
+    def perform(self, action: str):
+        """Apply a game action and set up the text and buttons it leads to."""
+        if action == 'fullscreen':
+            self.toggle_fullscreen()
+            
+        elif action == 'reveal':
+            self.text_renderer.reveal_all()
+            
+        elif action == 'text_speed':
+            self.text_speed = next_text_speed(self.text_speed)
+            self.text_renderer.set_speed(text_speed(self.text_speed), pygame.time.get_ticks())
+            
+        elif action == 'leaderboard':
+            text = self.toggle_leaderboard()
+            if text:
+                self.text_renderer.set_text(text)
+            
+        elif action == 'continue':
+            text = self.continue_story()
+            if text:
+                scene = self.take_prefetched_scene()
+                if scene:
+                    # Swap in the screen prepared while the result was read
+                    self.text_renderer.set_text(text, scene['text'])
+                    self.set_choice_buttons(scene['buttons'])
+                else:
+                    self.text_renderer.set_text(text)
+                    self.create_choice_buttons(self.current_encounter['options'])
+            
+        elif action in ['1', '2', '3'] and self.awaiting_choice:
+            text = self.make_choice(action)
+            if text:
+                self.clear_choice_buttons()  # Clear buttons after choice
+                self.text_renderer.set_text(text)
+                self.prefetch_scene()
+
+    def latency_report(self) -> str:
+        """Summary of the time from an input's arrival to the frame that shows its response."""
+        if not self.latencies:
+            return "No input to measure"
+        latencies = sorted(self.latencies)
+        return (
+            f"Input to response over the last {len(latencies)} inputs: "
+            f"median {statistics.median(latencies):.1f} ms, "
+            f"95th percentile {latencies[int(len(latencies) * 0.95)]:.1f} ms, "
+            f"worst {latencies[-1]:.1f} ms"
+        )
+
     def update_display(self):
         """Update the game display."""
         # Draw background
@@ -459,7 +675,7 @@ class DarkFantasyGame:
         
         # Update and render text
         self.text_renderer.update(pygame.time.get_ticks())
-        self.text_renderer.render()
+        self.text_rects = self.text_renderer.render()
         
         # Render stats
         core_stats = {
@@ -469,380 +685,76 @@ class DarkFantasyGame:
         }
         self.stats_display.render(core_stats, self.skills)
         
+        # Skill check behind the result, above the story text
+        if self.current_state in ['result', 'game_over', 'ending'] and self.last_skill_check:
+            check_text = self.stats_display.font.render(self.last_skill_check.replace('\n', ' - '), True, DARK_PARCHMENT)
+            self.screen.blit(check_text, self.layout.point(300, 165))
+        
         # Draw buttons if awaiting choice
         for button in self.buttons:
             button.draw(self.screen)
             
         # Draw continue prompt if not awaiting choice
-        if not self.awaiting_choice and self.current_state not in ['game_over', 'ending']:
+        if not self.awaiting_choice and self.current_state not in ['game_over', 'ending', 'leaderboard']:
             continue_text = self.font.render("Press SPACE to continue", True, PARCHMENT_YELLOW)
-            text_rect = continue_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
+            text_rect = continue_text.get_rect(center=self.layout.point(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
             self.screen.blit(continue_text, text_rect)
-        
-        pygame.display.flip()
 
-    def skill_check(self, skill: Skill, difficulty: int) -> bool:
-        """Perform a skill check with visual feedback."""
-        roll = random.randint(1, 20) + self.skills[skill]
-        result = roll >= difficulty
-        
-        # Create skill check result text
-        roll_text = f"Skill Check - {skill.display_name}: {roll} vs {difficulty}"
-        result_text = "SUCCESS!" if result else "FAILURE..."
-        
-        # Display skill check result
-        self.text_renderer.set_text(f"{roll_text}\n{result_text}")
-        pygame.time.wait(1500)  # Pause to show result
-        
-        return result
-
-    def get_ancient_ruin_trial(self) -> Dict:
-        """Generate a trial for the ancient ruins."""
-        trials = [
-            {
-                'description': "A mystical barrier of swirling darkness blocks your path...",
-                'skill': Skill.OCCULTISM,
-                'difficulty': 15,
-                'options': {
-                    '1': ('Attempt to dispel it with dark magic', -10, -15, +10),
-                    '2': ('Search for a way around', -5, -5, 0),
-                    '3': ('Force your way through', -20, -10, +15)
-                }
-            },
-            {
-                'description': "Ancient guardians, their armor crumbling with age, rise from their eternal slumber...",
-                'skill': Skill.COMBAT,
-                'difficulty': 14,
-                'options': {
-                    '1': ('Face them in combat', -15, -5, +5),
-                    '2': ('Try to sneak past', -5, -10, +10),
-                    '3': ('Attempt to command them', -10, -15, +20)
-                }
-            },
-            {
-                'description': "A creature of shadow and wisdom bars your path, its eyes gleaming with ancient knowledge...",
-                'skill': Skill.LORE,
-                'difficulty': 16,
-                'options': {
-                    '1': ('Answer its riddle', 0, -15, +10),
-                    '2': ('Offer it a trade', -10, -5, +15),
-                    '3': ('Try to outsmart it', -5, -20, +20)
-                }
-            }
-        ]
-        return random.choice(trials)
-
-    def get_random_encounter(self) -> Dict:
-        """Generate a random encounter based on current game state."""
-        base_encounters = [
-            {
-                'description': f"In the {self.current_weather} night, ethereal whispers emanate from behind a twisted tree...",
-                'skill': Skill.WILLPOWER,
-                'difficulty': 13,
-                'options': {
-                    '1': ('Investigate the whispers', -10, -15, +5),
-                    '2': ('Hurry past, covering your ears', 0, -5, 0),
-                    '3': ('Leave an offering by the tree', -5, 0, +10)
-                }
-            },
-            {
-                'description': "You discover a small shrine, its sacred symbols defaced with marks of dark power...",
-                'skill': Skill.OCCULTISM,
-                'difficulty': 14,
-                'options': {
-                    '1': ('Try to restore the shrine', -5, +10, -5),
-                    '2': ('Study the corrupted symbols', 0, -10, +15),
-                    '3': ('Destroy the shrine completely', 0, -15, +20)
-                }
-            },
-            {
-                'description': "A wounded traveler, their eyes filled with desperation, begs for your aid...",
-                'skill': Skill.PERSUASION,
-                'difficulty': 13,
-                'options': {
-                    '1': ('Offer assistance', -15, +5, 0),
-                    '2': ('Ignore their pleas', 0, -10, +5),
-                    '3': ('End their suffering', -5, -20, +25)
-                }
-            }
-        ]
+        # Reading speed setting
+        speed_text = self.stats_display.font.render(f"T - text speed: {self.text_speed}", True, DARK_PARCHMENT)
+        self.screen.blit(speed_text, (self.layout.px(10), self.layout.height - self.layout.px(25)))
 
-        # Add conditional encounters based on game state
-        if self.flags['ancient_door_opened'] and not self.locations['ancient_ruins'].is_cleared:
-            return self.get_ancient_ruin_trial()
-            
-        if self.flags['cursed_by_witch'] and random.random() < 0.3:
-            base_encounters.append({
-                'description': "The witch's curse manifests, reality warping around you...",
-                'skill': Skill.WILLPOWER,
-                'difficulty': 15,
-                'options': {
-                    '1': ('Resist the curse', -15, -20, 0),
-                    '2': ('Channel its power', -10, -15, +25),
-                    '3': ('Seek immediate refuge', -5, -10, +10)
-                }
-            })
-
-        return random.choice(base_encounters)
-
-    def handle_special_encounter(self, encounter_type: str) -> Dict:
-        """Handle special story encounters."""
-        if encounter_type == 'witch':
-            return {
-                'description': "Deep in the woods, you discover a crooked cottage. An ancient witch, her form shifting between shadow and substance, beckons you inside...",
-                'skill': Skill.WILLPOWER,
-                'difficulty': 15,
-                'options': {
-                    '1': ('Enter the cottage', -10, -15, +20),
-                    '2': ('Refuse and leave', -15, -10, +10),
-                    '3': ('Attack the witch', -40, -30, +30)
-                }
-            }
-        elif encounter_type == 'priest':
-            return {
-                'description': "The village priest, his eyes reflecting knowledge of your recent actions, confronts you in the candlelit church...",
-                'skill': Skill.PERSUASION,
-                'difficulty': 14,
-                'options': {
-                    '1': ('Seek his blessing', +20, +20, -10),
-                    '2': ('Ignore his warnings', 0, -15, +5),
-                    '3': ('Silence him permanently', -10, -25, +40)
-                }
-            }
-        return None
-
-    def handle_ending(self) -> Dict:
-        """Determine and return appropriate ending sequence."""
-        if self.locations['ancient_ruins'].is_cleared:
-            return {
-                'description': "Ancient power courses through your veins, reality bending to your will. The knowledge of ages fills your mind, threatening to overflow...",
-                'skill': Skill.OCCULTISM,
-                'difficulty': 18,
-                'options': {
-                    '1': ('Harness the power to reshape reality', 0, -30, +40),
-                    '2': ('Use the power to seal away the darkness', -20, -20, -20),
-                    '3': ('Release the power into the world', -30, -40, +50)
-                }
-            }
-        elif self.flags['cursed_by_witch'] and self.corruption >= 75:
-            return {
-                'description': "The witch's curse and your own corruption reach their peak, your very essence teetering between humanity and something... else.",
-                'skill': Skill.WILLPOWER,
-                'difficulty': 16,
-                'options': {
-                    '1': ('Embrace the transformation', -20, -40, +50),
-                    '2': ('Try to control and direct it', -30, -30, +30),
-                    '3': ('Fight against it', -40, -20, -20)
-                }
-            }
-        elif self.sanity <= 25:
-            return {
-                'description': "Your fractured mind reveals impossible truths, reality splitting into countless possibilities before your eyes...",
-                'skill': Skill.LORE,
-                'difficulty': 15,
-                'options': {
-                    '1': ('Embrace the madness and transcend', -30, -50, +40),
-                    '2': ('Try to find meaning in the chaos', -20, -30, +30),
-                    '3': ('Attempt to reconstruct your sanity', -10, +20, -10)
-                }
-            }
-        else:
-            return {
-                'description': "You stand at the crossroads of fate, the weight of your journey heavy upon your shoulders...",
-                'skill': Skill.SURVIVAL,
-                'difficulty': 14,
-                'options': {
-                    '1': ('Seek to heal the cursed land', -30, +20, -20),
-                    '2': ('Leave and never return', -10, +10, 0),
-                    '3': ('Continue your dark research', -20, -20, +30)
-                }
-            }
-
-    def handle_encounter(self, encounter: Dict, choice: str) -> str:
-        """Handle player choice in an encounter."""
-        action, health_mod, sanity_mod, corruption_mod = encounter['options'][choice]
-        success = self.skill_check(encounter['skill'], encounter['difficulty'])
-        
-        # Modify outcome based on skill check
-        if success:
-            health_mod = int(health_mod * 0.5)  # Reduce negative health impact
-            sanity_mod = int(sanity_mod * 0.5)  # Reduce negative sanity impact
-            result = f"Success! {action}\n"
-        else:
-            health_mod = int(health_mod * 1.5)  # Increase negative health impact
-            sanity_mod = int(sanity_mod * 1.5)  # Increase negative sanity impact
-            result = f"Failure! {action}\n"
-            
-        self.modify_stats(health_mod, sanity_mod, corruption_mod)
-        return result
-
-    def modify_stats(self, health=0, sanity=0, corruption=0):
-        """Modify player stats within bounds."""
-        self.health = max(0, min(100, self.health + health))
-        self.sanity = max(0, min(100, self.sanity + sanity))
-        self.corruption = max(0, min(100, self.corruption + corruption))
-
-    def check_game_over(self) -> Tuple[bool, str]:
-        """Check if game should end based on current stats."""
-        if self.health <= 0:
-            return True, "ENDING: Death claims another soul..."
-        if self.sanity <= 0:
-            return True, "ENDING: Your mind shatters into countless pieces..."
-        if self.corruption >= 100:
-            return True, "ENDING: The darkness consumes you completely..."
-        return False, ""
-
-    def get_ending_text(self, ending_type: str, success: bool, choice: str) -> str:
-        """Get the appropriate ending text based on the type and success."""
-        endings = {
-            'ancient_power': {
-                True: {
-                    '1': "ENDING: ASCENDED MASTER\nYou master the ancient power, ascending beyond mortal understanding...",
-                    '2': "ENDING: GUARDIAN OF REALITY\nYou become the eternal jailer of darkness, forever vigilant...",
-                    '3': "ENDING: CHAOS UNLEASHED\nReality bends and breaks as power floods the world..."
-                },
-                False: {
-                    '1': "ENDING: FAILED ASCENSION\nThe power proves too great, consuming your very essence...",
-                    '2': "ENDING: PYRRHIC VICTORY\nThe darkness is sealed, but claims you as its final victim...",
-                    '3': "ENDING: CATACLYSM\nThe power spirals beyond control, doom cascading across reality..."
-                }
-            },
-            'curse': {
-                True: {
-                    '1': "ENDING: DARK METAMORPHOSIS\nYour humanity fades as you embrace a new, terrible form...",
-                    '2': "ENDING: CURSE MASTER\nYou bend the dark energies to your will, though your soul may never recover...",
-                    '3': "ENDING: CURSE BREAKER\nThrough sheer force of will, you shatter the witch's curse..."
-                },
-                False: {
-                    '1': "ENDING: CONSUMED\nThe curse devours your being, leaving only darkness...",
-                    '2': "ENDING: LOST CONTROL\nThe curse overwhelms your attempts at mastery...",
-                    '3': "ENDING: FAILED RESISTANCE\nYour rebellion against the curse ends in tragedy..."
-                }
-            },
-            'madness': {
-                True: {
-                    '1': "ENDING: TRANSCENDENT MADNESS\nYou find enlightenment in chaos, becoming something beyond...",
-                    '2': "ENDING: CHAOS PROPHET\nYou emerge as a herald of cosmic truth, forever changed...",
-                    '3': "ENDING: RECONSTRUCTED\nFrom the fragments of your mind, you forge a new understanding..."
-                },
-                False: {
-                    '1': "ENDING: SHATTERED REALITY\nYour grasp on reality dissolves completely...",
-                    '2': "ENDING: LOST PROPHET\nThe truths you glimpse drive you deeper into madness...",
-                    '3': "ENDING: FRACTURED\nYour mind splinters beyond any hope of recovery..."
-                }
-            },
-            'redemption': {
-                True: {
-                    '1': "ENDING: SALVATION\nYour sacrifice brings healing to this cursed land...",
-                    '2': "ENDING: CLEAN ESCAPE\nYou find peace far from the shadows of Ravencross...",
-                    '3': "ENDING: ENLIGHTENED SEEKER\nYou master the balance between light and dark..."
-                },
-                False: {
-                    '1': "ENDING: NOBLE SACRIFICE\nYour attempt at redemption claims your life...",
-                    '2': "ENDING: HAUNTED ESCAPE\nThough you flee, the darkness follows...",
-                    '3': "ENDING: CONSUMED SEEKER\nYour research leads you back into darkness..."
-                }
-            }
-        }
-
-        # Determine ending type based on game state
-        if self.locations['ancient_ruins'].is_cleared:
-            ending_category = 'ancient_power'
-        elif self.flags['cursed_by_witch'] and self.corruption >= 75:
-            ending_category = 'curse'
-        elif self.sanity <= 25:
-            ending_category = 'madness'
-        else:
-            ending_category = 'redemption'
+        # Point to the run history once the run is over
+        if self.current_state in ['game_over', 'ending']:
+            records_text = self.font.render("Press L to view the Hall of Records", True, PARCHMENT_YELLOW)
+            text_rect = records_text.get_rect(center=self.layout.point(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
+            self.screen.blit(records_text, text_rect)
 
-        return endings[ending_category][success][choice]
+        pygame.display.flip()
 
     def play(self):
         """Main game loop."""
         running = True
         
         # Initial setup
-        intro_text = (f"Welcome to the Dark Path...\n\n"
-                     f"You arrive at the village of Ravencross on a {self.current_weather} night.\n"
-                     f"The {self.moon_phase} moon hangs above, and the villagers seem {self.village_state}.\n\n"
-                     f"Press SPACE to continue...")
-        self.text_renderer.set_text(intro_text)
+        self.text_renderer.set_text(self.story_text)
+        self.prefetch_scene()
+        next_frame = pygame.time.get_ticks()
+        self.queue_empty_since = time.perf_counter()
         
         while running:
-            choice = self.handle_input()
+            first_arrival = None  # Of the first input answered this frame
             
-            if choice == 'quit':
-                running = False
-                
-            elif choice == 'continue':
-                if self.current_state == 'intro':
-                    self.current_encounter = self.get_random_encounter()
-                    self.text_renderer.set_text(self.current_encounter['description'])
-                    self.create_choice_buttons(self.current_encounter['options'])
-                    self.current_state = 'encounter'
-                    self.awaiting_choice = True
-                    
-                elif self.current_state == 'result':
-                    if self.current_state != 'game_over' and self.current_state != 'ending':
-                        self.current_encounter = self.get_random_encounter()
-                        self.text_renderer.set_text(self.current_encounter['description'])
-                        self.create_choice_buttons(self.current_encounter['options'])
-                        self.current_state = 'encounter'
-                        self.awaiting_choice = True
-                
-            elif choice in ['1', '2', '3'] and self.awaiting_choice:
-                # Handle special encounters
-                if self.encounters_completed == 5 and not self.flags['encountered_witch']:
-                    self.current_encounter = self.handle_special_encounter('witch')
-                    if choice == '1':
-                        self.flags['has_ritual_knowledge'] = True
-                    elif choice == '3':
-                        self.flags['cursed_by_witch'] = True
-                    self.flags['encountered_witch'] = True
-                    
-                elif self.encounters_completed == 10 and self.flags['priest_alive']:
-                    self.current_encounter = self.handle_special_encounter('priest')
-                    if choice == '3':
-                        self.flags['priest_alive'] = False
-                
-                # Process choice
-                result = self.handle_encounter(self.current_encounter, choice)
-                self.buttons.clear()  # Clear buttons after choice
-                
-                # Handle ancient ruins progress
-                if self.flags['ancient_door_opened'] and not self.locations['ancient_ruins'].is_cleared:
-                    self.locations['ancient_ruins'].trials_completed += 1
-                    if self.locations['ancient_ruins'].trials_completed >= self.locations['ancient_ruins'].required_trials:
-                        self.locations['ancient_ruins'].is_cleared = True
-                        result += "\nYou have conquered the ancient ruins!"
-                        self.modify_stats(+20, +20, +30)
-                
-                # Check for game over or ending
-                game_over, message = self.check_game_over()
-                if game_over:
-                    self.text_renderer.set_text(message)
-                    self.current_state = 'game_over'
-                elif self.encounters_completed >= 20:
-                    ending_encounter = self.handle_ending()
-                    success = self.skill_check(ending_encounter['skill'], ending_encounter['difficulty'])
-                    ending_text = self.get_ending_text(
-                        'ending_type',  # This will be determined inside get_ending_text
-                        success,
-                        choice
-                    )
-                    self.text_renderer.set_text(ending_text)
-                    self.current_state = 'ending'
-                else:
-                    self.text_renderer.set_text(f"{result}\n\nPress SPACE to continue...")
-                    self.current_state = 'result'
-                    self.awaiting_choice = False
-                    self.encounters_completed += 1
+            for event, arrived in self.wait_for_input(next_frame):
+                action = self.handle_event(event)
+                if action == 'quit':
+                    running = False
+                    break
+                if action:
+                    self.perform(action)
+                    if first_arrival is None:
+                        first_arrival = arrived
             
             self.update_display()
-            pygame.time.Clock().tick(60)
+            if first_arrival is not None:
+                self.latencies.append((time.perf_counter() - first_arrival) * 1000)
+            next_frame = pygame.time.get_ticks() + FRAME_TIME
         
+        self.prefetcher.shutdown()  # Fonts must outlive the prefetch thread
+        self.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    game = DarkFantasyGame()
+    parser = argparse.ArgumentParser(description="Play Dark Path.")
+    parser.add_argument('--fullscreen', action='store_const', const='fullscreen', dest='display_mode',
+                        help="start fullscreen at the desktop resolution (F11 toggles)")
+    parser.add_argument('--scaled', action='store_const', const='scaled', dest='display_mode',
+                        help="render at 1024x768 and let the GPU scale it to the window")
+    parser.add_argument('--report-latency', action='store_true',
+                        help="print the measured input-to-response time on exit")
+    args = parser.parse_args()
+    
+    game = DarkFantasyGame(display_mode=args.display_mode or 'windowed')
     game.play()
+    if args.report_latency:
+        print(game.latency_report())
@@ -0,0 +1,228 @@
+import argparse
+import ast
+import importlib.util
+import multiprocessing
+import os
+import random
+import signal
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Render headless: must be set before pygame initialises SDL
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from game_state import GameState, ENDINGS, GAME_OVER_MESSAGES
+
+# Visual regression check for the pygame front-end.
+# Every encounter, trial, special event and ending screen is rendered with
+# its text fully revealed and its buttons showing, sharded across a process
+# pool, and compared pixel by pixel against the stored golden frames.
+
+GAME_DIR = Path(__file__).resolve().parent
+GAME_SCRIPT = GAME_DIR / "Dark Fantasy Text Adventure.py"
+GOLDEN_DIR = GAME_DIR / "golden_frames"
+OUTPUT_DIR = GAME_DIR / "frame_output"
+
+GOLDEN_SEED = 1234          # Fixes the skills and setting rolls on every frame
+PIXEL_TOLERANCE = 8         # Per-channel difference treated as noise
+MAX_CHANGED_PIXELS = 50     # Changed pixels allowed before a frame fails
+
+# The game instance owned by each worker process
+worker_game = None
+
+def load_game_module():
+    """Import the pygame front-end, whose file name isn't a module name."""
+    spec = importlib.util.spec_from_file_location("dark_fantasy_game", GAME_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def find_duplicate_methods(path) -> List[str]:
+    """Find methods defined twice in one class, where the first is dead code."""
+    duplicates = []
+    tree = ast.parse(Path(path).read_text(encoding='utf-8'))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            seen = set()
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef):
+                    if item.name in seen:
+                        duplicates.append(f"{node.name}.{item.name} (line {item.lineno})")
+                    seen.add(item.name)
+    return duplicates
+
+def screen(name, state, text, options=None) -> Dict:
+    """Describe one screen to render."""
+    return {
+        'name': name,
+        'state': state,
+        'text': text,
+        'options': options,
+        'awaiting_choice': options is not None or state in ['game_over', 'ending']
+    }
+
+def collect_screens(game: GameState) -> List[Dict]:
+    """List every distinct screen the game can show."""
+    screens = [screen('intro', 'intro', game.get_intro_text())]
+
+    encounters = [
+        (f"encounter_{i + 1}", encounter)
+        for i, encounter in enumerate(game.get_base_encounters())
+    ]
+    encounters.append(("encounter_curse", game.get_curse_encounter()))
+    encounters += [
+        (f"trial_{i + 1}", trial)
+        for i, trial in enumerate(game.get_ancient_ruin_trials())
+    ]
+    encounters += [
+        (f"special_{kind}", game.handle_special_encounter(kind))
+        for kind in ['witch', 'priest']
+    ]
+    encounters += [
+        (f"final_{category}", encounter)
+        for category, encounter in game.get_ending_encounters().items()
+    ]
+    for name, encounter in encounters:
+        screens.append(screen(name, 'encounter', encounter['description'], encounter['options']))
+
+    # One result screen; the rest differ only in the action text
+    action = game.get_base_encounters()[0]['options']['1'][0]
+    screens.append(screen('result', 'result', f"Success! {action}\n\n\nPress SPACE to continue..."))
+
+    for category, outcomes in ENDINGS.items():
+        for success, texts in outcomes.items():
+            for choice, text in texts.items():
+                outcome = 'success' if success else 'failure'
+                screens.append(screen(f"ending_{category}_{outcome}_{choice}", 'ending', text))
+    for category, text in GAME_OVER_MESSAGES.items():
+        screens.append(screen(f"game_over_{category}", 'game_over', text))
+    return screens
+
+def init_worker():
+    """Start pygame once per worker with a deterministic, silent game."""
+    global worker_game
+    os.chdir(GAME_DIR)
+    module = load_game_module()
+    random.seed(GOLDEN_SEED)
+    worker_game = module.DarkFantasyGame(audio=False, telemetry_path=os.devnull, history_path=':memory:')
+    # SDL turns SIGTERM into a quit event; restore it so the pool can stop us
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def render_screen(game, spec: Dict) -> pygame.Surface:
+    """Draw one screen exactly as the game loop would."""
+    game.current_state = spec['state']
+    game.awaiting_choice = spec['awaiting_choice']
+    game.text_renderer.set_text(spec['text'])
+    game.text_renderer.reveal_all()
+    if spec['options']:
+        game.create_choice_buttons(spec['options'])
+    else:
+        game.clear_choice_buttons()
+    game.update_display()
+    return game.screen
+
+def check_layout(game) -> List[str]:
+    """Report text lines that overlap a panel or button, or leave the window."""
+    problems = []
+    panels = [game.stats_display.core_stats_rect, game.stats_display.skills_rect]
+    panels += [button.rect for button in game.buttons]
+    window = game.screen.get_rect()
+    for rect in game.text_rects:
+        if rect.collidelist(panels) != -1:
+            problems.append(f"text at {tuple(rect)} overlaps {tuple(panels[rect.collidelist(panels)])}")
+        if not window.contains(rect):
+            problems.append(f"text at {tuple(rect)} leaves the window")
+    return problems
+
+def diff_frame(surface: pygame.Surface, golden_path: Path) -> Tuple[int, np.ndarray]:
+    """Count pixels that differ from the golden frame beyond the tolerance."""
+    try:
+        golden = pygame.image.load(str(golden_path))
+    except pygame.error:
+        golden = None  # Unreadable golden frames fail like a resized one
+    if golden is None or golden.get_size() != surface.get_size():
+        return surface.get_width() * surface.get_height(), None
+    rendered = pygame.surfarray.array3d(surface).astype(np.int16)
+    expected = pygame.surfarray.array3d(golden).astype(np.int16)
+    changed = (np.abs(rendered - expected) > PIXEL_TOLERANCE).any(axis=2)
+    return int(changed.sum()), changed
+
+def render_shard(shard: List[Dict], golden_dir: Path, output_dir: Path, update: bool) -> List[Tuple[str, str, str]]:
+    """Render, layout-check and diff one worker's share of the screens."""
+    results = []
+    for spec in shard:
+        name = spec['name']
+        surface = render_screen(worker_game, spec)
+        layout_problems = check_layout(worker_game)
+        golden_path = golden_dir / f"{name}.png"
+
+        if update:
+            pygame.image.save(surface, str(golden_path))
+            status, detail = 'updated', ""
+        elif not golden_path.exists():
+            # A missing golden must not quietly become the new baseline
+            status, detail = 'missing', "no golden frame; run with --update to create it"
+        else:
+            changed_pixels, changed = diff_frame(surface, golden_path)
+            if changed_pixels > MAX_CHANGED_PIXELS:
+                # Keep the frame and a red-marked copy for review
+                pygame.image.save(surface, str(output_dir / f"{name}.png"))
+                if changed is not None:
+                    marked = pygame.surfarray.array3d(surface)
+                    marked[changed] = (255, 0, 0)
+                    pygame.image.save(pygame.surfarray.make_surface(marked), str(output_dir / f"{name}_diff.png"))
+                status, detail = 'changed', f"{changed_pixels} pixels differ"
+            else:
+                status, detail = 'ok', ""
+
+        if layout_problems:
+            status, detail = 'layout', "; ".join(layout_problems)
+        results.append((name, status, detail))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every game screen and diff it against golden frames.")
+    parser.add_argument('--update', action='store_true',
+                        help="overwrite the golden frames with the current rendering")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="number of render processes")
+    parser.add_argument('--golden-dir', type=Path, default=GOLDEN_DIR)
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR,
+                        help="where failing frames and their diffs are written")
+    args = parser.parse_args()
+
+    failed = False
+    for duplicate in find_duplicate_methods(GAME_SCRIPT):
+        print(f"DUPLICATE  {duplicate}")
+        failed = True
+
+    random.seed(GOLDEN_SEED)
+    screens = collect_screens(GameState(os.devnull, ':memory:'))
+    args.golden_dir.mkdir(parents=True, exist_ok=True)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = max(1, min(args.workers, len(screens)))
+    shards = [screens[i::workers] for i in range(workers)]
+    with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+        shard_results = pool.starmap(
+            render_shard,
+            [(shard, args.golden_dir.resolve(), args.output_dir.resolve(), args.update) for shard in shards]
+        )
+        pool.close()
+        pool.join()
+
+    results = sorted(result for shard in shard_results for result in shard)
+    for name, status, detail in results:
+        if status != 'ok':
+            print(f"{status.upper():<10} {name} {detail}")
+        failed = failed or status in ['changed', 'layout', 'missing']
+    print(f"{len(results)} screens rendered with {workers} workers")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
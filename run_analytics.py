@@ -0,0 +1,159 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from telemetry import (
+    RECORD_FIELDS, SKILL_NAMES, WEATHERS, MOON_PHASES, VILLAGE_STATES,
+    ENDING_CATEGORIES, EVENT_TURN, EVENT_GAME_OVER, EVENT_ENDING, TELEMETRY_LOG
+)
+
+# Columnar analysis of telemetry logs and simulated-run output.
+# Logs are memory-mapped and walked in fixed-size chunks, and every
+# aggregate is a bincount over the chunk's columns, so memory use depends
+# on CHUNK_ROWS rather than on the size of the log.
+
+RECORD_DTYPE = np.dtype([(name, '<' + code) for name, code in RECORD_FIELDS])
+CHUNK_ROWS = 1 << 20  # ~22 MB of records per pass
+
+N_SKILLS = len(SKILL_NAMES)
+N_ENDINGS = len(ENDING_CATEGORIES)
+N_WEATHERS = len(WEATHERS)
+N_MOONS = len(MOON_PHASES)
+N_VILLAGES = len(VILLAGE_STATES)
+
+def open_log(path) -> np.memmap:
+    """Memory-map a telemetry log as a record array."""
+    # Ignore a trailing partial record left by an interrupted write
+    rows = Path(path).stat().st_size // RECORD_DTYPE.itemsize
+    if rows == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(rows,))
+
+class RunAggregates:
+    def __init__(self):
+        self.turns = 0
+        self.runs_finished = 0
+        self.bad_rows = 0  # Rows with out-of-range codes, skipped
+        # Final outcome of each run by primary skill
+        self.endings_by_skill = np.zeros((N_SKILLS, N_ENDINGS), dtype=np.int64)
+        # Final outcome split by whether the witch cursed the player
+        self.endings_by_curse = np.zeros((2, N_ENDINGS), dtype=np.int64)
+        # Game-over turn totals over the full weather x moon x village grid
+        self.death_count = np.zeros((N_WEATHERS, N_MOONS, N_VILLAGES), dtype=np.int64)
+        self.death_turn_sum = np.zeros((N_WEATHERS, N_MOONS, N_VILLAGES), dtype=np.float64)
+
+    def add_chunk(self, chunk: np.ndarray):
+        """Fold one block of records into the running totals."""
+        # Skip rows that can't be real records, e.g. from a log misaligned
+        # by a torn write, rather than let them break the bincounts
+        valid = (
+            (chunk['primary_skill'] < N_SKILLS)
+            & (chunk['weather'] < N_WEATHERS)
+            & (chunk['moon_phase'] < N_MOONS)
+            & (chunk['village_state'] < N_VILLAGES)
+            & (chunk['cursed_by_witch'] < 2)
+            & (chunk['event'] <= EVENT_ENDING)
+            & (chunk['ending'] < N_ENDINGS)
+        )
+        self.bad_rows += int(len(chunk) - valid.sum())
+        chunk = chunk[valid]
+        self.turns += len(chunk)
+
+        final = chunk[chunk['event'] != EVENT_TURN]
+        self.runs_finished += len(final)
+        ending = final['ending'].astype(np.intp)
+
+        cell = final['primary_skill'].astype(np.intp) * N_ENDINGS + ending
+        self.endings_by_skill += np.bincount(
+            cell, minlength=N_SKILLS * N_ENDINGS
+        ).reshape(N_SKILLS, N_ENDINGS)
+
+        cell = final['cursed_by_witch'].astype(np.intp) * N_ENDINGS + ending
+        self.endings_by_curse += np.bincount(
+            cell, minlength=2 * N_ENDINGS
+        ).reshape(2, N_ENDINGS)
+
+        deaths = final[final['event'] == EVENT_GAME_OVER]
+        cell = np.ravel_multi_index(
+            (deaths['weather'], deaths['moon_phase'], deaths['village_state']),
+            self.death_count.shape
+        )
+        size = self.death_count.size
+        self.death_count += np.bincount(cell, minlength=size).reshape(self.death_count.shape)
+        self.death_turn_sum += np.bincount(
+            cell, weights=deaths['turn'], minlength=size
+        ).reshape(self.death_count.shape)
+
+    def add_log(self, path, chunk_rows=CHUNK_ROWS):
+        """Stream a whole log through add_chunk."""
+        records = open_log(path)
+        for start in range(0, len(records), chunk_rows):
+            self.add_chunk(records[start:start + chunk_rows])
+        del records
+
+    def mean_death_turn(self, axis: int) -> np.ndarray:
+        """Average game-over turn for each value of one setting roll."""
+        other = tuple(a for a in range(3) if a != axis)
+        count = self.death_count.sum(axis=other)
+        total = self.death_turn_sum.sum(axis=other)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return total / count
+
+def format_ending_table(title, row_names, table) -> str:
+    """Format an endings table as share of each row, hiding empty columns."""
+    used = np.flatnonzero(table.sum(axis=0))
+    names = [ENDING_CATEGORIES[i] for i in used]
+    width = max(len(n) for n in row_names)
+    lines = [title, ' ' * width + ''.join(f"{n:>15}" for n in names)]
+    totals = table.sum(axis=1)
+    for name, row, total in zip(row_names, table[:, used], totals):
+        shares = row / total if total else np.zeros(len(used))
+        lines.append(f"{name:<{width}}" + ''.join(f"{s:>15.1%}" for s in shares))
+    return '\n'.join(lines)
+
+def format_death_turns(aggregates: RunAggregates) -> str:
+    """Format mean game-over turn by each setting roll."""
+    lines = ["Mean death turn"]
+    for label, names, axis in (
+        ('weather', WEATHERS, 0),
+        ('moon', MOON_PHASES, 1),
+        ('village', VILLAGE_STATES, 2)
+    ):
+        means = aggregates.mean_death_turn(axis)
+        for name, mean in zip(names, means):
+            value = "-" if np.isnan(mean) else f"{mean:.2f}"
+            lines.append(f"  {label:<8}{name:<16}{value:>8}")
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate Dark Path telemetry logs.")
+    parser.add_argument('logs', nargs='*', default=[str(TELEMETRY_LOG)],
+                        help="telemetry or simulation logs to analyse")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                        help="records processed per vectorized pass")
+    args = parser.parse_args()
+
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+
+    missing = [path for path in args.logs if not Path(path).is_file()]
+    if missing:
+        parser.error(f"no telemetry log at {', '.join(missing)} - play a game first or pass a log path")
+
+    aggregates = RunAggregates()
+    for path in args.logs:
+        aggregates.add_log(path, args.chunk_rows)
+
+    print(f"{aggregates.turns} turns, {aggregates.runs_finished} finished runs")
+    if aggregates.bad_rows:
+        print(f"{aggregates.bad_rows} corrupt records skipped")
+    print()
+    print(format_ending_table("Endings by primary skill", SKILL_NAMES, aggregates.endings_by_skill))
+    print()
+    print(format_death_turns(aggregates))
+    print()
+    print(format_ending_table("Endings by witch curse", ('not cursed', 'cursed'), aggregates.endings_by_curse))
+
+if __name__ == "__main__":
+    main()
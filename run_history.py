@@ -0,0 +1,148 @@
+import platform
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from telemetry import SKILL_NAMES
+
+# Persistent history of completed runs, shared by every front-end.
+# Runs live in one wide table. Per-ending and per-device summaries are kept
+# up to date in the same transaction as each insert, so the leaderboard
+# queries read a handful of rows no matter how many runs are stored.
+
+RUN_HISTORY_DB = Path(".") / "run_history.db"
+SKILL_COLUMNS = tuple(name.lower() for name in SKILL_NAMES)
+
+RUN_COLUMNS = (
+    'device', 'seed', 'finished_at', 'duration',
+    'ending_category', 'ending_title', 'success', 'score',
+    'health', 'sanity', 'corruption', 'encounters',
+    'weather', 'moon_phase', 'village_state', 'cursed_by_witch'
+) + SKILL_COLUMNS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    device TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    finished_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    ending_category TEXT NOT NULL,
+    ending_title TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    health INTEGER NOT NULL,
+    sanity INTEGER NOT NULL,
+    corruption INTEGER NOT NULL,
+    encounters INTEGER NOT NULL,
+    weather TEXT NOT NULL,
+    moon_phase TEXT NOT NULL,
+    village_state TEXT NOT NULL,
+    cursed_by_witch INTEGER NOT NULL,
+    {', '.join(f'{column} INTEGER NOT NULL' for column in SKILL_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS runs_by_ending ON runs (ending_title, score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_device ON runs (device, score DESC);
+
+CREATE TABLE IF NOT EXISTS ending_counts (
+    ending_title TEXT PRIMARY KEY,
+    ending_category TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    first_unlocked REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS endings_by_rarity ON ending_counts (runs);
+
+CREATE TABLE IF NOT EXISTS device_stats (
+    device TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    total_duration REAL NOT NULL,
+    best_score INTEGER NOT NULL
+);
+"""
+
+INSERT_RUN = (
+    f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in RUN_COLUMNS)})"
+)
+UPDATE_ENDING = """
+INSERT INTO ending_counts (ending_title, ending_category, runs, first_unlocked)
+VALUES (?, ?, 1, ?)
+ON CONFLICT (ending_title) DO UPDATE SET runs = runs + 1
+"""
+UPDATE_DEVICE = """
+INSERT INTO device_stats (device, runs, total_duration, best_score)
+VALUES (?, 1, ?, ?)
+ON CONFLICT (device) DO UPDATE SET
+    runs = runs + 1,
+    total_duration = total_duration + excluded.total_duration,
+    best_score = max(best_score, excluded.best_score)
+"""
+
+def this_device() -> str:
+    """Name used to group runs played on this machine."""
+    return platform.node() or "unknown"
+
+def run_score(health: int, sanity: int, corruption: int, game_over=False, success=False) -> int:
+    """Leaderboard score for a finished run.
+    
+    Successful endings always outrank failed ones, which outrank runs that
+    ended in game over; the final stats order runs within each group.
+    """
+    outcome = 0 if game_over else 2 if success else 1
+    return outcome * 1000 + health + sanity + (100 - corruption)
+
+class RunHistory:
+    def __init__(self, path=RUN_HISTORY_DB):
+        self.conn = sqlite3.connect(str(path))
+        self.conn.row_factory = sqlite3.Row
+        try:
+            # WAL lets the leaderboard read while another process writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        except sqlite3.Error:
+            self.conn.close()
+            raise
+
+    def record(self, run: Dict):
+        """Store a finished run and update the summaries in one transaction."""
+        with self.conn:
+            self.conn.execute(INSERT_RUN, tuple(run[column] for column in RUN_COLUMNS))
+            self.conn.execute(
+                UPDATE_ENDING,
+                (run['ending_title'], run['ending_category'], run['finished_at'])
+            )
+            self.conn.execute(
+                UPDATE_DEVICE,
+                (run['device'], run['duration'], run['score'])
+            )
+
+    def top_runs(self, ending_title: Optional[str] = None, device: Optional[str] = None, limit=5) -> List[sqlite3.Row]:
+        """Best scoring runs, optionally for one ending or one device."""
+        if ending_title is not None:
+            query = "SELECT * FROM runs WHERE ending_title = ? ORDER BY score DESC LIMIT ?"
+            params = (ending_title, limit)
+        elif device is not None:
+            query = "SELECT * FROM runs WHERE device = ? ORDER BY score DESC LIMIT ?"
+            params = (device, limit)
+        else:
+            query = "SELECT * FROM runs ORDER BY score DESC LIMIT ?"
+            params = (limit,)
+        return self.conn.execute(query, params).fetchall()
+
+    def rarest_endings(self, limit=5) -> List[sqlite3.Row]:
+        """Endings unlocked so far, least common first."""
+        return self.conn.execute(
+            "SELECT * FROM ending_counts ORDER BY runs ASC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def device_stats(self, device: Optional[str] = None) -> Optional[sqlite3.Row]:
+        """Run count, play time and best score for one device."""
+        return self.conn.execute(
+            "SELECT * FROM device_stats WHERE device = ?", (device or this_device(),)
+        ).fetchone()
+
+    def close(self):
+        """Close the database."""
+        self.conn.close()
@@ -0,0 +1,118 @@
+import os
+import struct
+from pathlib import Path
+
+# Turn log written by the game and read back by run_analytics.py.
+# Every turn is one fixed-size, little-endian record appended to a flat
+# binary file, so a log of any length can be memory-mapped as a column
+# table without parsing. Simulated runs should be written through the same
+# TelemetryLog so both sources share a single format.
+
+TELEMETRY_LOG = Path(".") / "telemetry.bin"
+
+# Code tables - the stored value is the index into these tuples.
+# SKILL_NAMES follows the declaration order of the Skill enum.
+SKILL_NAMES = ('Occultism', 'Combat', 'Persuasion', 'Survival', 'Lore', 'Willpower')
+WEATHERS = ('stormy', 'misty', 'clear but dark')
+MOON_PHASES = ('new', 'waxing', 'full', 'waning')
+VILLAGE_STATES = ('fearful', 'hostile', 'desperate')
+ENDING_CATEGORIES = (
+    'none',           # Run still in progress
+    'ancient_power',
+    'curse',
+    'madness',
+    'redemption',
+    'death',          # Health reached 0
+    'shattered',      # Sanity reached 0
+    'consumed'        # Corruption reached 100
+)
+
+# Event kinds
+EVENT_TURN = 0
+EVENT_GAME_OVER = 1
+EVENT_ENDING = 2
+
+# (field name, struct code) in on-disk order
+RECORD_FIELDS = (
+    ('run_id', 'Q'),
+    ('turn', 'H'),
+    ('primary_skill', 'B'),
+    ('weather', 'B'),
+    ('moon_phase', 'B'),
+    ('village_state', 'B'),
+    ('cursed_by_witch', 'B'),
+    ('health', 'B'),
+    ('sanity', 'B'),
+    ('corruption', 'B'),
+    ('event', 'B'),
+    ('ending', 'B'),
+    ('success', 'B'),
+    ('choice', 'B'),
+)
+RECORD_FORMAT = '<' + ''.join(code for _, code in RECORD_FIELDS)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+# Write buffer holding whole records, so a buffer flush never splits one
+WRITE_BUFFER_SIZE = RECORD_SIZE * 512
+
+class TelemetryLog:
+    def __init__(self, path=TELEMETRY_LOG):
+        self.path = Path(path)
+        self.file = None
+        self.run_id = 0
+        self.enabled = True
+
+    def start_run(self):
+        """Begin a new run with a fresh id."""
+        # Drawn from os.urandom so logging never disturbs the game's RNG
+        self.run_id = int.from_bytes(os.urandom(8), 'little')
+
+    def record(self, game, event=EVENT_TURN, ending='none', success=False, choice='0'):
+        """Append one turn record describing the current game state."""
+        if not self.enabled:
+            return
+        record = struct.pack(
+            RECORD_FORMAT,
+            self.run_id,
+            game.encounters_completed,
+            SKILL_NAMES.index(game.primary_skill.display_name),
+            WEATHERS.index(game.current_weather),
+            MOON_PHASES.index(game.moon_phase),
+            VILLAGE_STATES.index(game.village_state),
+            game.flags['cursed_by_witch'],
+            game.health,
+            game.sanity,
+            game.corruption,
+            event,
+            ENDING_CATEGORIES.index(ending),
+            success,
+            int(choice)
+        )
+        try:
+            if self.file is None:
+                self.file = self.open_log()
+            self.file.write(record)
+            # A finished run reaches the disk even if the process is killed later
+            if event != EVENT_TURN:
+                self.file.flush()
+        except OSError as e:
+            # Telemetry is best effort; a read-only install must still play
+            print(f"Warning: Could not write telemetry: {e}")
+            self.enabled = False
+
+    def open_log(self):
+        """Open the log for appending, cutting off a torn record at its end.
+        
+        A process killed mid-write can leave a partial record; appending
+        after it would misalign every record that follows.
+        """
+        file = open(self.path, 'ab', buffering=WRITE_BUFFER_SIZE)
+        torn = file.tell() % RECORD_SIZE
+        if torn:
+            file.truncate(file.tell() - torn)
+        return file
+
+    def close(self):
+        """Flush and close the log file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
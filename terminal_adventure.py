@@ -0,0 +1,202 @@
+import time
+STARTED = time.perf_counter()
+
+import argparse
+import bisect
+import curses
+import textwrap
+from typing import List, Tuple
+
+from game_state import GameState
+from text_pacing import CHAR_DELAY, reveal_schedule, next_text_speed, text_speed
+
+# Text-mode front-end for play-testing in a terminal, e.g. over SSH on a
+# headless machine. It plays the same GameState as the pygame window but
+# must never import pygame, SDL or the audio stack, so the first prompt is
+# on screen as soon as Python has loaded the game rules.
+
+TEXT_WIDTH = 72    # Wrap width on wide terminals
+TEXT_TOP = 4       # First row of story text, below the stats
+
+class TerminalGame(GameState):
+    def __init__(self, stdscr, animate=True):
+        # Set up the terminal before the game opens its log and database,
+        # so a terminal that can't be set up leaves nothing open
+        self.stdscr = stdscr
+        self.animate = animate
+        self.shown_text = ""
+        self.text_speed = 'normal'
+
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass  # Terminals such as vt100 can't hide the cursor
+        self.stdscr.keypad(True)
+        self.text_attr = curses.A_NORMAL
+        self.dim_attr = curses.A_DIM
+        if curses.has_colors():
+            curses.start_color()
+            curses.use_default_colors()
+            curses.init_pair(1, curses.COLOR_YELLOW, -1)
+            self.text_attr = curses.color_pair(1)
+            self.dim_attr = curses.color_pair(1) | curses.A_DIM
+
+        super().__init__()
+
+    def put(self, y: int, x: int, text: str, attr=None):
+        """Write text clipped to the window, ignoring rows that don't fit."""
+        height, width = self.stdscr.getmaxyx()
+        if 0 <= y < height and x < width:
+            try:
+                self.stdscr.addstr(y, x, text[:width - x - 1], self.text_attr if attr is None else attr)
+            except curses.error:
+                pass  # Writing the bottom-right cell always raises
+
+    def wrap(self, text: str) -> List[Tuple[str, bool]]:
+        """Word wrap text to the terminal, keeping explicit line breaks.
+        
+        Each line comes with whether it ends a paragraph.
+        """
+        width = max(20, min(TEXT_WIDTH, self.stdscr.getmaxyx()[1] - 4))
+        lines = []
+        for paragraph in text.split('\n'):
+            wrapped = textwrap.wrap(paragraph, width) or ['']
+            lines.extend((line, i == len(wrapped) - 1) for i, line in enumerate(wrapped))
+        return lines
+
+    def draw_stats(self):
+        """Draw core stats and skills across the top of the screen."""
+        self.put(0, 2, f"HEALTH {self.health}   SANITY {self.sanity}   CORRUPTION {self.corruption}", self.text_attr | curses.A_BOLD)
+        skills = "   ".join(f"{skill.display_name} {value}" for skill, value in self.skills.items())
+        self.put(1, 2, skills, self.dim_attr)
+        if self.current_state in ['result', 'game_over', 'ending'] and self.last_skill_check:
+            self.put(2, 2, self.last_skill_check.replace('\n', ' - '), self.dim_attr)
+
+    def draw_prompt(self, top: int):
+        """Draw the choices or the continue prompt below the story text."""
+        height = self.stdscr.getmaxyx()[0]
+        if self.current_state == 'encounter':
+            for i, (key, (text, _, _, _)) in enumerate(self.current_encounter['options'].items()):
+                self.put(top + 1 + i, 4, f"{key}) {text}", self.text_attr | curses.A_BOLD)
+            footer = "1-3 choose   Q quit"
+        elif self.current_state in ['game_over', 'ending']:
+            footer = "L Hall of Records   Q quit"
+        elif self.current_state == 'leaderboard':
+            footer = "L return   Q quit"
+        else:
+            footer = "SPACE continue   L Hall of Records   Q quit"
+        self.put(height - 1, 2, footer, self.dim_attr)
+
+    def type_out(self, lines: List[Tuple[str, bool]]):
+        """Reveal lines on the shared typewriter schedule; any key shows the rest."""
+        # Pace the text as written: soft wraps are spaces, paragraph ends newlines
+        text = ""
+        positions = []
+        for row, (line, ends_paragraph) in enumerate(lines):
+            text += line + ('\n' if ends_paragraph else ' ')
+            positions += [(TEXT_TOP + row, 2 + col) for col in range(len(line) + 1)]
+        schedule = reveal_schedule(text, CHAR_DELAY, text_speed(self.text_speed))
+
+        start = time.perf_counter()
+        shown = 0
+        self.stdscr.nodelay(True)
+        try:
+            while shown < len(text):
+                elapsed = (time.perf_counter() - start) * 1000
+                due = bisect.bisect_right(schedule, elapsed)
+                # Write everything that came due since the last pass at once
+                if due > shown:
+                    for index in range(shown, due):
+                        if text[index] not in ' \n':
+                            self.put(*positions[index], text[index])
+                    self.stdscr.refresh()
+                    shown = due
+                if shown == len(text):
+                    break
+
+                key = self.stdscr.getch()
+                if key in (ord('t'), ord('T')):
+                    self.change_text_speed()
+                    schedule = reveal_schedule(text, CHAR_DELAY, text_speed(self.text_speed))
+                    start = time.perf_counter() - (schedule[shown - 1] if shown else 0) / 1000
+                elif key != -1:
+                    return
+                # Sleep until the next character is due, staying responsive to keys
+                curses.napms(int(min(50, max(1, schedule[shown] - elapsed))))
+        finally:
+            self.stdscr.nodelay(False)
+
+    def change_text_speed(self):
+        """Cycle the reading speed and show the new setting."""
+        self.text_speed = next_text_speed(self.text_speed)
+        self.draw_speed()
+        self.stdscr.refresh()
+
+    def draw_speed(self):
+        """Show the reading speed setting in the top right corner."""
+        width = self.stdscr.getmaxyx()[1]
+        label = f"T speed: {self.text_speed:<7}"
+        self.put(0, max(0, width - len(label) - 2), label, self.dim_attr)
+
+    def show(self, text: str, animate=None):
+        """Redraw the whole screen for new story text."""
+        self.shown_text = text
+        lines = self.wrap(text)
+        self.stdscr.erase()
+        self.draw_stats()
+        self.draw_speed()
+        if self.animate if animate is None else animate:
+            self.type_out(lines)
+        for row, (line, _) in enumerate(lines):
+            self.put(TEXT_TOP + row, 2, line)
+        self.draw_prompt(TEXT_TOP + len(lines))
+        self.stdscr.refresh()
+
+    def play(self):
+        """Main game loop."""
+        self.show(self.story_text)
+
+        while True:
+            key = self.stdscr.getch()
+            text = None
+
+            if key in (ord('q'), ord('Q')):
+                break
+            elif key == curses.KEY_RESIZE:
+                self.show(self.shown_text, animate=False)
+            elif key in (ord('t'), ord('T')):
+                self.change_text_speed()
+            elif key in (ord('l'), ord('L')):
+                text = self.toggle_leaderboard()
+            elif key == ord(' '):
+                text = self.continue_story()
+            elif key in (ord('1'), ord('2'), ord('3')) and self.awaiting_choice:
+                text = self.make_choice(chr(key))
+
+            if text:
+                self.show(text)
+
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Dark Path in a terminal.")
+    parser.add_argument('--no-typewriter', action='store_true',
+                        help="show text immediately instead of typing it out")
+    parser.add_argument('--measure-startup', action='store_true',
+                        help="draw the first prompt, then exit and print the time it took")
+    args = parser.parse_args()
+
+    if args.measure_startup:
+        def first_prompt(stdscr):
+            game = TerminalGame(stdscr, animate=False)
+            game.show(game.story_text)
+            elapsed = (time.perf_counter() - STARTED) * 1000
+            game.close()
+            return elapsed
+        print(f"First prompt after {curses.wrapper(first_prompt):.1f} ms")
+        return
+
+    curses.wrapper(lambda stdscr: TerminalGame(stdscr, not args.no_typewriter).play())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from typing import List
+
+# Typewriter pacing shared by the pygame and terminal front-ends.
+# A reveal is a schedule of times (ms after the reveal starts) at which
+# each character appears, so a front-end only has to compare the elapsed
+# time against it and show everything that is due, whatever its frame rate.
+
+CHAR_DELAY = 50  # Milliseconds per character at normal speed
+
+# Extra pause after punctuation that ends a word or sentence
+PUNCTUATION_PAUSES = {
+    '.': 300,
+    '!': 300,
+    '?': 300,
+    ',': 120,
+    ';': 150,
+    ':': 150,
+    '\n': 200
+}
+
+# Accessibility setting, as multiples of the normal reading speed
+TEXT_SPEEDS = (
+    ('normal', 1.0),
+    ('fast', 2.0),
+    ('instant', None),
+    ('slow', 0.5)
+)
+
+def reveal_schedule(text: str, char_delay=CHAR_DELAY, speed=1.0) -> List[float]:
+    """Time in milliseconds at which each character of text is revealed."""
+    if speed is None:
+        return [0.0] * len(text)
+
+    schedule = []
+    time = 0.0
+    for i, char in enumerate(text):
+        time += char_delay / speed
+        schedule.append(time)
+        # Pause once after a run of punctuation, e.g. after "..." not each dot
+        ends_word = i + 1 == len(text) or text[i + 1] in ' \n' or char == '\n'
+        if char in PUNCTUATION_PAUSES and ends_word:
+            time += PUNCTUATION_PAUSES[char] / speed
+    return schedule
+
+def next_text_speed(name: str) -> str:
+    """The speed setting that follows name, wrapping around."""
+    names = [speed_name for speed_name, _ in TEXT_SPEEDS]
+    return names[(names.index(name) + 1) % len(names)]
+
+def text_speed(name: str):
+    """Speed multiplier for a named setting, or None for instant text."""
+    return dict(TEXT_SPEEDS)[name]